@@ -0,0 +1,121 @@
+"""Comparar el arranque y la memoria del modo gráfico y del modo headless
+
+Lanza varias veces cada modo de gestuapp.py, lee la línea "Arranque (...)" que
+imprime cuando está listo, lo termina y muestra la mediana de cada modo. Si no
+hay pantalla y Xvfb está instalado, el modo gráfico se ejecuta en un servidor X
+virtual.
+
+    python comparar_modos.py --video grabacion.mp4 --repeticiones 5
+"""
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestuapp.py")
+PATRON = re.compile(r"Arranque \((\w+)\): ([\d.]+)s desde (\w+), memoria residente: ([\d.]+|None) MB")
+
+
+def parse_args(argv=None):
+    """Leer las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Comparar arranque y memoria de los modos gráfico y headless")
+    parser.add_argument("--video", metavar="RUTA", help="video a usar como entrada en lugar de la cámara")
+    parser.add_argument("--repeticiones", type=int, default=3, help="ejecuciones de cada modo (3 por defecto)")
+    parser.add_argument("--espera", type=float, default=60.0, metavar="SEGUNDOS",
+                        help="tiempo máximo hasta que un modo informa de su arranque (60 por defecto)")
+    parser.add_argument("--modos", nargs="+", choices=["gui", "headless"], default=["gui", "headless"],
+                        help="modos a comparar (ambos por defecto)")
+    return parser.parse_args(argv)
+
+
+def iniciar_pantalla():
+    """Devolver (entorno, proceso Xvfb) para el modo gráfico, o (None, None) si no hay pantalla"""
+    entorno = dict(os.environ)
+    if sys.platform == "win32" or entorno.get("DISPLAY") or entorno.get("WAYLAND_DISPLAY"):
+        return entorno, None
+    if not shutil.which("Xvfb"):
+        return None, None
+
+    xvfb = subprocess.Popen(["Xvfb", ":99", "-screen", "0", "1280x720x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1.0)
+    if xvfb.poll() is not None:
+        return None, None
+    entorno["DISPLAY"] = ":99"
+    return entorno, xvfb
+
+
+def medir(modo, args, entorno, directorio):
+    """Ejecutar un modo hasta que informa de su arranque y devolver (segundos, MB)"""
+    comando = [sys.executable, "-u", SCRIPT]
+    if modo == "headless":
+        comando += ["--headless", "--socket", os.path.join(directorio, "control.sock")]
+    if args.video:
+        comando += ["--video", args.video]
+
+    proceso = subprocess.Popen(comando, env=entorno, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True)
+    # La lectura bloquea: si el modo no llega a informar, se mata y se cierra su salida
+    limite = threading.Timer(args.espera, proceso.kill)
+    limite.start()
+    try:
+        for linea in proceso.stdout:
+            coincidencia = PATRON.search(linea)
+            if coincidencia:
+                memoria = coincidencia.group(4)
+                return float(coincidencia.group(2)), None if memoria == "None" else float(memoria)
+        return None
+    finally:
+        limite.cancel()
+        proceso.terminate()
+        try:
+            proceso.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proceso.kill()
+            proceso.wait()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    directorio = tempfile.mkdtemp(prefix="gestuapp_modos_")
+    entorno_gui, xvfb = iniciar_pantalla() if "gui" in args.modos else (None, None)
+
+    resultados = {}
+    try:
+        for modo in args.modos:
+            entorno = entorno_gui if modo == "gui" else dict(os.environ)
+            if entorno is None:
+                print(f"{modo}: sin pantalla (define DISPLAY o instala Xvfb), se omite")
+                continue
+            muestras = []
+            for i in range(args.repeticiones):
+                muestra = medir(modo, args, entorno, directorio)
+                print(f"{modo} #{i + 1}: " + ("sin respuesta" if muestra is None else
+                                              f"{muestra[0]:.2f}s, {muestra[1]} MB"))
+                if muestra is not None:
+                    muestras.append(muestra)
+            if muestras:
+                memorias = [memoria for _, memoria in muestras if memoria is not None]
+                resultados[modo] = (statistics.median(t for t, _ in muestras),
+                                    statistics.median(memorias) if memorias else None)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+            xvfb.wait()
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    print(f"\nMediana de {args.repeticiones} ejecuciones:")
+    print(f"{'modo':<10}{'arranque':>10}{'memoria':>12}")
+    for modo, (tiempo, memoria) in resultados.items():
+        print(f"{modo:<10}{tiempo:>9.2f}s{'n/d' if memoria is None else f'{memoria:.1f} MB':>12}")
+    return 0 if len(resultados) == len(args.modos) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,294 @@
+"""Configuración persistente de GestuApp
+
+Valores por defecto, acciones disponibles, esquema versionado del archivo y
+ConfigStore. Solo usa la biblioteca estándar, así que se puede importar y probar
+sin OpenCV, MediaPipe ni Tk.
+"""
+import collections
+import copy
+import json
+import math
+import os
+import tempfile
+import threading
+
+
+# Configuración por defecto
+DEFAULT_CONFIG = {
+    "DISTANCIA_MIN_VOL": 0.05,
+    "DISTANCIA_MAX_VOL": 0.15,
+    "UMBRAL_PAUSA": 0.025,
+    "UMBRAL_ANGULO_CANCION": 50,
+    "UMBRAL_ANGULO_VOLUMEN": 30,
+    "TIEMPO_ENTRE_ACCIONES": 1.5,
+    "INVERTIR_DIRECCION_CANCION": False,
+    "VELOCIDAD_SCROLL": 0.5,
+    "GESTOS_ACCIONES": {
+        "pulgar_indice_cerca": "play_pause",
+        "angulo_grande_izquierda": "anterior",
+        "angulo_grande_derecha": "siguiente",
+        "angulo_pequeno_distancia": "volumen",
+        "angulo_pequeno_movimiento": "scroll"
+    }
+}
+
+# Acciones disponibles
+ACCIONES = {
+    "play_pause": {"nombre": "Play/Pause", "tecla": "play/pause"},
+    "anterior": {"nombre": "Canción Anterior", "tecla": "previous track"},
+    "siguiente": {"nombre": "Canción Siguiente", "tecla": "next track"},
+    "volumen": {"nombre": "Control de Volumen", "tecla": None},
+    "scroll": {"nombre": "Control de Scroll", "tecla": None},  # Unificado scrol
+    "nada": {"nombre": "No hacer nada", "tecla": None}
+}
+
+# Ruta del archivo de configuración
+CONFIG_FILE = os.path.join(os.path.expanduser("~"), "gesture_controller_config.json")
+
+# Versión del esquema del archivo de configuración (los archivos sin "VERSION" son v1)
+CONFIG_VERSION = 2
+
+
+def migrar_v1(config):
+    """v1 -> v2: completar los gestos que faltan en GESTOS_ACCIONES"""
+    gestos = config.setdefault("GESTOS_ACCIONES", {})
+    for gesto, accion in DEFAULT_CONFIG["GESTOS_ACCIONES"].items():
+        gestos.setdefault(gesto, accion)
+    return config
+
+
+# Migraciones de cada versión a la siguiente
+MIGRACIONES = {1: migrar_v1}
+
+
+class ConfigStore:
+    """Configuración persistente con escritura atómica y diferida, esquema versionado
+    y notificación de cambios a los suscriptores
+
+    `config` se reemplaza completo en cada cambio, así que quien lo lee siempre ve
+    una versión coherente sin necesidad de bloqueos. Los diffs se encolan con el lock
+    tomado, en el orden en que se aplicaron, y se entregan después de soltarlo.
+    """
+
+    def __init__(self, ruta=None, retardo=0.5):
+        self.ruta = ruta or CONFIG_FILE
+        self.retardo = retardo
+        self._lock = threading.RLock()
+        self._suscriptores = []
+        self._notificaciones = collections.deque()
+        self._despachando = threading.Lock()
+        self._temporizador = None
+        self._pendiente = False
+
+        self.config, self._version_archivo = self._leer()
+        # Solo se reescribe el archivo al arrancar si hubo que migrarlo
+        if self._version_archivo < CONFIG_VERSION:
+            self._pendiente = True
+            self.flush()
+
+    def _leer(self):
+        """Leer y migrar el archivo; devuelve (config, versión que tenía el archivo)"""
+        try:
+            with open(self.ruta, 'r') as f:
+                datos = json.load(f)
+        except FileNotFoundError:
+            return copy.deepcopy(DEFAULT_CONFIG), CONFIG_VERSION
+        except (OSError, ValueError) as e:
+            print(f"Error al cargar configuración: {e}")
+            return copy.deepcopy(DEFAULT_CONFIG), CONFIG_VERSION
+
+        try:
+            if not isinstance(datos, dict):
+                raise ValueError("el archivo no contiene un objeto JSON")
+            version = datos.pop("VERSION", 1)
+            if isinstance(version, bool) or not isinstance(version, int) or version < 1:
+                raise ValueError(f"versión no válida: {version!r}")
+            if version > CONFIG_VERSION:
+                print(f"Configuración con versión {version} más nueva que la soportada ({CONFIG_VERSION}); "
+                      f"los cambios no se guardarán en el archivo")
+            for origen in range(version, CONFIG_VERSION):
+                datos = MIGRACIONES[origen](datos)
+
+            # Los valores que faltan o no son válidos toman el valor por defecto
+            for clave, valor in DEFAULT_CONFIG.items():
+                if clave not in datos:
+                    datos[clave] = copy.deepcopy(valor)
+                    continue
+                try:
+                    self._validar(clave, datos[clave])
+                except ValueError as e:
+                    print(f"Error al cargar configuración: {e}; se usa el valor por defecto")
+                    datos[clave] = copy.deepcopy(valor)
+            for gesto, accion in DEFAULT_CONFIG["GESTOS_ACCIONES"].items():
+                datos["GESTOS_ACCIONES"].setdefault(gesto, accion)
+            return datos, version
+        except Exception as e:
+            print(f"Error al cargar configuración: {e}")
+            return copy.deepcopy(DEFAULT_CONFIG), CONFIG_VERSION
+
+    def _validar(self, clave, valor):
+        """Comprobar que un valor es válido para la clave (KeyError o ValueError si no)"""
+        if clave not in DEFAULT_CONFIG:
+            raise KeyError(f"Parámetro desconocido: {clave}")
+        if clave == "GESTOS_ACCIONES":
+            if not isinstance(valor, dict):
+                raise ValueError(f"Valor no válido para {clave}: {valor!r}")
+            for gesto, accion in valor.items():
+                if gesto not in DEFAULT_CONFIG["GESTOS_ACCIONES"] \
+                        or not isinstance(accion, str) or accion not in ACCIONES:
+                    raise ValueError(f"Mapeo no válido: {gesto} -> {accion}")
+        elif isinstance(DEFAULT_CONFIG[clave], bool) != isinstance(valor, bool) \
+                or not isinstance(valor, (int, float)) or not math.isfinite(valor) or valor < 0:
+            raise ValueError(f"Valor no válido para {clave}: {valor!r}")
+
+    def get(self):
+        """Obtener una copia de la configuración actual"""
+        return copy.deepcopy(self.config)
+
+    def update(self, cambios):
+        """Aplicar cambios, programar su guardado y notificar; devuelve el diff"""
+        with self._lock:
+            nueva = copy.deepcopy(self.config)
+            for clave, valor in cambios.items():
+                self._validar(clave, valor)
+                if clave == "GESTOS_ACCIONES":
+                    nueva[clave].update(valor)
+                else:
+                    nueva[clave] = valor
+
+            diff = self._diferencias(self.config, nueva)
+            if not diff:
+                return diff
+            self.config = nueva
+            self._pendiente = True
+            self._programar_guardado()
+            self._encolar(diff)
+        self._despachar()
+        return diff
+
+    def reset(self):
+        """Restaurar los valores por defecto"""
+        return self.update(copy.deepcopy(DEFAULT_CONFIG))
+
+    def reload(self):
+        """Volver a leer el archivo, descartando cambios no guardados; devuelve el diff"""
+        with self._lock:
+            nueva, self._version_archivo = self._leer()
+            diff = self._diferencias(self.config, nueva)
+            self.config = nueva
+            self._pendiente = self._version_archivo < CONFIG_VERSION
+            if self._temporizador:
+                self._temporizador.cancel()
+                self._temporizador = None
+            if self._pendiente:
+                self.flush()
+            self._encolar(diff)
+        self._despachar()
+        return diff
+
+    def _programar_guardado(self):
+        """Agrupar cambios seguidos (p. ej. al mover un slider) en una sola escritura"""
+        if self._temporizador:
+            self._temporizador.cancel()
+        self._temporizador = threading.Timer(self.retardo, self.flush)
+        self._temporizador.daemon = True
+        self._temporizador.start()
+
+    def flush(self):
+        """Escribir ya los cambios pendientes (archivo temporal + rename atómico)"""
+        with self._lock:
+            if self._temporizador:
+                self._temporizador.cancel()
+                self._temporizador = None
+            if not self._pendiente:
+                return
+            if self._version_archivo > CONFIG_VERSION:
+                # Reescribirlo como CONFIG_VERSION perdería lo que esta versión no entiende
+                print(f"No se guarda la configuración: el archivo tiene la versión {self._version_archivo} "
+                      f"y esta aplicación solo soporta hasta la {CONFIG_VERSION}")
+                self._pendiente = False
+                return
+            datos = {"VERSION": CONFIG_VERSION, **self.config}
+            try:
+                fd, temporal = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(self.ruta)), prefix=".gestuapp_", suffix=".tmp"
+                )
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(datos, f, indent=4, allow_nan=False)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temporal, self.ruta)
+                except BaseException:
+                    os.unlink(temporal)
+                    raise
+                self._pendiente = False
+            except Exception as e:
+                print(f"Error al guardar configuración: {e}")
+
+    def subscribe(self, callback, claves=None):
+        """Llamar a callback(diff) cuando cambie alguna de las claves (todas si es None)
+
+        El diff tiene la forma {clave: (valor_anterior, valor_nuevo)}. Los callbacks
+        se llaman sin el lock del store, de uno en uno y en el orden de los cambios,
+        desde el thread que hizo el cambio o desde otro que ya estaba notificando; así
+        que pueden bloquear o volver a modificar la configuración, pero mientras tanto
+        retrasan a los demás suscriptores.
+        """
+        claves = self.validar_claves(claves)
+        with self._lock:
+            self._suscriptores.append((callback, set(claves) if claves else None))
+
+    @staticmethod
+    def validar_claves(claves):
+        """Comprobar la lista de claves de una suscripción (None son todas); ValueError si no es válida"""
+        if claves is None:
+            return None
+        if not isinstance(claves, (list, tuple, set, frozenset)):
+            raise ValueError(f"Se esperaba una lista de claves: {claves!r}")
+        if not claves:
+            raise ValueError("La lista de claves está vacía")
+        for clave in claves:
+            if not isinstance(clave, str) or clave not in DEFAULT_CONFIG:
+                raise ValueError(f"Parámetro desconocido: {clave!r}")
+        return list(claves)
+
+    def unsubscribe(self, callback):
+        """Dejar de notificar a callback"""
+        with self._lock:
+            self._suscriptores = [(c, k) for c, k in self._suscriptores if c != callback]
+
+    def _diferencias(self, antes, despues):
+        return {
+            clave: copy.deepcopy((antes.get(clave), despues.get(clave)))
+            for clave in antes.keys() | despues.keys()
+            if antes.get(clave) != despues.get(clave)
+        }
+
+    def _encolar(self, diff):
+        """Preparar las notificaciones de un cambio; se llama con el lock tomado para que
+        queden en el mismo orden en que se aplicaron los cambios"""
+        for callback, claves in self._suscriptores:
+            filtrado = diff if claves is None else {c: v for c, v in diff.items() if c in claves}
+            if filtrado:
+                self._notificaciones.append((callback, filtrado))
+
+    def _despachar(self):
+        """Entregar las notificaciones encoladas, ya sin el lock del store
+
+        Solo un thread las entrega a la vez; si otro ya lo está haciendo, también
+        entregará las que acaban de encolarse.
+        """
+        # Se repite por si algo se encoló entre el último popleft y el release
+        while self._notificaciones:
+            if not self._despachando.acquire(blocking=False):
+                return
+            try:
+                while self._notificaciones:
+                    callback, filtrado = self._notificaciones.popleft()
+                    try:
+                        callback(filtrado)
+                    except Exception as e:
+                        print(f"Error al notificar cambio de configuración: {e}")
+            finally:
+                self._despachando.release()
@@ -1,115 +1,960 @@
+import time
+
+# Marca de importación del módulo: solo se usa para medir el arranque si el sistema
+# no informa de cuándo se creó el proceso
+_T_INICIO_PROCESO = time.perf_counter()
+
 import cv2
 import mediapipe as mp
 import numpy as np
 import keyboard
-import time
 import math
 import threading
-import pystray
-from PIL import Image, ImageDraw
 import json
 import os
+import sys
+import signal
+import socket
+import socketserver
+import argparse
+import collections
+import queue
+import select
 from functools import partial
-import customtkinter as ctk
-from tkinter import messagebox
-
-# Configuración de apariencia
-ctk.set_appearance_mode("System")  # Puede ser "Light", "Dark" o "System"
-ctk.set_default_color_theme("blue")  # Temas: "blue", "green", "dark-blue"
-
-# Configuración por defecto
-DEFAULT_CONFIG = {
-    "DISTANCIA_MIN_VOL": 0.05,
-    "DISTANCIA_MAX_VOL": 0.15,
-    "UMBRAL_PAUSA": 0.025,
-    "UMBRAL_ANGULO_CANCION": 50,
-    "UMBRAL_ANGULO_VOLUMEN": 30,
-    "TIEMPO_ENTRE_ACCIONES": 1.5,
-    "INVERTIR_DIRECCION_CANCION": False,
-    "VELOCIDAD_SCROLL": 0.5,
-    "GESTOS_ACCIONES": {
-        "pulgar_indice_cerca": "play_pause",
-        "angulo_grande_izquierda": "anterior",
-        "angulo_grande_derecha": "siguiente",
-        "angulo_pequeno_distancia": "volumen",
-        "angulo_pequeno_movimiento": "scroll"
-    }
-}
 
-# Acciones disponibles
-ACCIONES = {
-    "play_pause": {"nombre": "Play/Pause", "tecla": "play/pause"},
-    "anterior": {"nombre": "Canción Anterior", "tecla": "previous track"},
-    "siguiente": {"nombre": "Canción Siguiente", "tecla": "next track"},
-    "volumen": {"nombre": "Control de Volumen", "tecla": None},
-    "scroll": {"nombre": "Control de Scroll", "tecla": None},  # Unificado scrol
-    "nada": {"nombre": "No hacer nada", "tecla": None}
-}
+from config_store import ACCIONES, ConfigStore
+
+# Dependencias de la interfaz gráfica: solo se importan fuera del modo headless
+ctk = None
+messagebox = None
+pystray = None
+Image = None
+ImageDraw = None
+
+
+def cargar_gui():
+    """Importar las dependencias de la interfaz gráfica (Tk y bandeja del sistema)"""
+    global ctk, messagebox, pystray, Image, ImageDraw
+    import customtkinter as ctk
+    import pystray
+    from tkinter import messagebox
+    from PIL import Image, ImageDraw
+
+    # Configuración de apariencia
+    ctk.set_appearance_mode("System")  # Puede ser "Light", "Dark" o "System"
+    ctk.set_default_color_theme("blue")  # Temas: "blue", "green", "dark-blue"
+
+
+# Ruta del socket de control (modo headless y cliente)
+SOCKET_FILE = os.path.join(os.environ.get("XDG_RUNTIME_DIR", os.path.expanduser("~")), "gestuapp.sock")
+
+
+def _memoria_windows_mb():
+    """Working set del proceso en Windows (equivalente a la memoria residente)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t)
+        ]
 
-# Ruta del archivo de configuración
-CONFIG_FILE = os.path.join(os.path.expanduser("~"), "gesture_controller_config.json")
+    kernel32 = ctypes.WinDLL("kernel32")
+    psapi = ctypes.WinDLL("psapi")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD
+    ]
+    psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+
+    contadores = PROCESS_MEMORY_COUNTERS()
+    contadores.cb = ctypes.sizeof(contadores)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(contadores), contadores.cb):
+        return None
+    return contadores.WorkingSetSize / (1024 * 1024)
+
+
+def memoria_residente_mb():
+    """Obtener la memoria residente del proceso en MB (None si no se puede medir)"""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        try:
+            return _memoria_windows_mb()
+        except (OSError, AttributeError):
+            return None
+    try:
+        import resource
+        # Sin /proc solo está disponible el pico (KB en Linux, bytes en macOS)
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maximo / (1024 * 1024) if sys.platform == "darwin" else maximo / 1024
+    except ImportError:
+        return None
 
 
-class GestureController:
-    def __init__(self):
-        # Cargar configuración
-        self.load_config()
+def _edad_proceso_windows():
+    """Segundos desde la creación del proceso en Windows"""
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.GetProcessTimes.argtypes = [wintypes.HANDLE] + [ctypes.POINTER(wintypes.FILETIME)] * 4
+    kernel32.GetProcessTimes.restype = wintypes.BOOL
+
+    creacion, salida, nucleo, usuario, ahora = (wintypes.FILETIME() for _ in range(5))
+    if not kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), ctypes.byref(creacion), ctypes.byref(salida),
+                                    ctypes.byref(nucleo), ctypes.byref(usuario)):
+        return None
+    kernel32.GetSystemTimeAsFileTime(ctypes.byref(ahora))
+
+    # FILETIME cuenta intervalos de 100 ns
+    def a_entero(ft):
+        return (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+    return (a_entero(ahora) - a_entero(creacion)) / 1e7
+
+
+def edad_proceso():
+    """Segundos desde que se creó el proceso, incluido el arranque del intérprete
+
+    Devuelve (segundos, origen); si el sistema no lo informa se mide desde la
+    importación de este módulo.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # El campo 22 (starttime) está en ticks desde el arranque del sistema;
+            # se separa tras el nombre del comando, que puede contener espacios
+            campos = f.read().rsplit(")", 1)[1].split()
+        inicio = int(campos[19]) / os.sysconf("SC_CLK_TCK")
+        with open("/proc/uptime") as f:
+            return float(f.read().split()[0]) - inicio, "proceso"
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        try:
+            segundos = _edad_proceso_windows()
+            if segundos is not None:
+                return segundos, "proceso"
+        except (OSError, AttributeError):
+            pass
+    return time.perf_counter() - _T_INICIO_PROCESO, "importacion"
+
+
+def medir_arranque(modo):
+    """Medir tiempo de arranque y memoria residente del modo actual"""
+    memoria = memoria_residente_mb()
+    segundos, origen = edad_proceso()
+    metricas = {
+        "modo": modo,
+        "tiempo_s": round(segundos, 3),
+        "desde": origen,
+        "memoria_mb": round(memoria, 1) if memoria is not None else None
+    }
+    # flush: otro proceso puede leerlo a través de una tubería
+    print(f"Arranque ({modo}): {metricas['tiempo_s']:.2f}s desde {origen}, "
+          f"memoria residente: {metricas['memoria_mb']} MB", flush=True)
+    return metricas
+
+
+def descriptores_abiertos():
+    """Contar los descriptores de archivo abiertos (handles en Windows; None si no se puede medir)"""
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+            kernel32 = ctypes.WinDLL("kernel32")
+            kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+            kernel32.GetProcessHandleCount.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+            kernel32.GetProcessHandleCount.restype = wintypes.BOOL
+            cantidad = wintypes.DWORD()
+            if kernel32.GetProcessHandleCount(kernel32.GetCurrentProcess(), ctypes.byref(cantidad)):
+                return cantidad.value
+        except (OSError, AttributeError):
+            pass
+        return None
+    for ruta in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(ruta))
+        except OSError:
+            pass
+    return None
+
+
+class Watchdog:
+    """Vigilar el crecimiento de memoria, hilos, descriptores y latencia por frame
+
+    Cada muestra se compara con la primera tomada tras el calentamiento; si el
+    crecimiento supera algún límite se registra una alerta. Si en ese momento el
+    motor estaba parado o en pausa, la base de la latencia es su primera medida.
+    """
+
+    def __init__(self, motor=None, intervalo=60.0, calentamiento=2, max_memoria_mb=64.0,
+                 max_hilos=4, max_descriptores=16, max_deriva_latencia=2.0, max_alertas=100):
+        self.motor = motor
+        self.intervalo = intervalo
+        self.calentamiento = calentamiento
+        self.limites = {
+            "memoria_mb": max_memoria_mb,
+            "hilos": max_hilos,
+            "descriptores": max_descriptores
+        }
+        self.max_deriva_latencia = max_deriva_latencia
+
+        self.muestras = 0
+        self.base = None
+        self.ultima = None
+        # Solo se conservan las últimas alertas: el watchdog corre durante días
+        self.alertas = collections.deque(maxlen=max_alertas)
+        self.total_alertas = 0
+        self.sin_medir = set()
+        # comprobar() corre en el thread del watchdog y resumen() en los del socket
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._hilo = None
+
+    def muestrear(self):
+        """Tomar una muestra del estado del proceso"""
+        return {
+            "memoria_mb": memoria_residente_mb(),
+            "hilos": threading.active_count(),
+            "descriptores": descriptores_abiertos(),
+            "latencia_ms": self.motor.latencia_ms if self.motor else None
+        }
+
+    def comprobar(self, muestra=None):
+        """Comparar una muestra con la base y devolver las alertas nuevas"""
+        muestra = muestra or self.muestrear()
+        with self._lock:
+            return self._comparar(muestra)
+
+    def _comparar(self, muestra):
+        self.muestras += 1
+        self.ultima = muestra
+        if self.muestras <= self.calentamiento:
+            return []
+        if self.base is None:
+            # Se compara también consigo misma para avisar ya de lo que no se puede medir
+            self.base = dict(muestra)
+
+        nuevas = []
+        for clave, limite in self.limites.items():
+            if muestra[clave] is None or self.base[clave] is None:
+                # Avisar una sola vez de que esta métrica no se está vigilando
+                if clave not in self.sin_medir:
+                    self.sin_medir.add(clave)
+                    print(f"Watchdog: no se puede medir {clave} en esta plataforma; no se vigila")
+                continue
+            crecimiento = muestra[clave] - self.base[clave]
+            if crecimiento > limite:
+                nuevas.append(f"{clave} creció {crecimiento:.1f} (límite {limite})")
+
+        if self.motor is not None and not self.base["latencia_ms"]:
+            if muestra["latencia_ms"]:
+                self.base["latencia_ms"] = muestra["latencia_ms"]
+                self.sin_medir.discard("latencia_ms")
+            elif "latencia_ms" not in self.sin_medir:
+                # Sin ningún frame procesado todavía no hay deriva que comprobar
+                self.sin_medir.add("latencia_ms")
+                print("Watchdog: latencia_ms aún sin medir (motor parado o en pausa); no se vigila hasta el primer frame")
+        elif self.base["latencia_ms"] and muestra["latencia_ms"] is not None:
+            deriva = muestra["latencia_ms"] / self.base["latencia_ms"]
+            if deriva > self.max_deriva_latencia:
+                nuevas.append(f"latencia_ms x{deriva:.2f} respecto a la base (límite x{self.max_deriva_latencia})")
+
+        for alerta in nuevas:
+            print(f"Watchdog: {alerta}")
+        self.alertas.extend(nuevas)
+        self.total_alertas += len(nuevas)
+        return nuevas
+
+    def resumen(self):
+        """Obtener la base, la última muestra y las alertas registradas"""
+        with self._lock:
+            return {
+                "base": dict(self.base) if self.base else None,
+                "ultima": self.ultima,
+                "alertas": list(self.alertas)[-10:],
+                "total_alertas": self.total_alertas,
+                "sin_medir": sorted(self.sin_medir)
+            }
+
+    def start(self):
+        """Muestrear periódicamente en un thread separado"""
+        self._parar.clear()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+        return self
+
+    def stop(self):
+        """Detener el muestreo periódico"""
+        self._parar.set()
+        if self._hilo:
+            self._hilo.join(timeout=1.0)
+
+    def _bucle(self):
+        while not self._parar.wait(self.intervalo):
+            self.comprobar()
+
+
+class GestureEngine:
+    """Motor de detección de gestos, independiente de la interfaz gráfica"""
+
+    def __init__(self, mostrar_camara=True, fuente_video=0, ruta_config=None):
+        # Cargar configuración (los cambios se aplican en caliente, sin reiniciar)
+        self.config_store = ConfigStore(ruta_config)
+        self.config_store.subscribe(self.on_config_change, ["GESTOS_ACCIONES"])
 
         # Variables de control
         self.running = False
         self.paused = False
-        self.window_visible = False
         self.ultimo_gesto = 0
         self.cambio_listo = True
-        self.cap = None
+
+        # Cámara (índice) o video grabado (ruta, se repite en bucle)
+        self.fuente_video = fuente_video
+        # Reloj de los tiempos entre gestos (el soak test lo sustituye por uno simulado)
+        self.reloj = time.time
 
         # Configuración de MediaPipe
         self.mp_hands = mp.solutions.hands
-        self.hands = None
         self.mp_drawing = mp.solutions.drawing_utils
 
+        # Iniciar thread para procesamiento de video
+        self.video_thread = None
+        self._control_lock = threading.RLock()
+
+        # Añadir variables para control de la ventana (no existe en modo headless)
+        self.mostrar_camara = mostrar_camara
+        self._camera_window_open = mostrar_camara
+        self._camera_lock = threading.Lock()
+
+        # Estadísticas expuestas por el socket de control
+        self.frames_procesados = 0
+        self.fps = 0.0
+        self.ultimo_comando = None
+        self.latencia_ms = 0.0
+        self.metricas_arranque = {}
+        self.watchdog = None
+
+    @property
+    def config(self):
+        """Configuración vigente, leída en cada frame por el procesamiento"""
+        return self.config_store.config
+
+    def on_config_change(self, diff):
+        """Con un nuevo mapeo de gestos, no esperar al anti-rebote del anterior"""
+        self.cambio_listo = True
+
+    def save_config(self):
+        """Guardar ya los cambios pendientes en el archivo"""
+        self.config_store.flush()
+
+    def update_config(self, cambios):
+        """Aplicar cambios de configuración en caliente (se guardan de forma diferida)"""
+        return self.config_store.update(cambios)
+
+    def reset_config(self):
+        """Restaurar la configuración por defecto"""
+        return self.config_store.reset()
+
+    def reload_config(self):
+        """Volver a leer la configuración del archivo y aplicarla"""
+        return self.config_store.reload()
+
+    def get_config(self):
+        """Obtener una copia de la configuración actual"""
+        return self.config_store.get()
+
+    def subscribe(self, callback, claves=None):
+        """Recibir los cambios de configuración como diff (ver ConfigStore.subscribe)"""
+        self.config_store.subscribe(callback, claves)
+
+    def unsubscribe(self, callback):
+        self.config_store.unsubscribe(callback)
+
+    def get_stats(self):
+        """Obtener estadísticas del procesamiento en curso"""
+        memoria = memoria_residente_mb()
+        return {
+            "running": self.running,
+            "paused": self.paused,
+            "frames": self.frames_procesados,
+            "fps": round(self.fps, 1),
+            "latencia_ms": round(self.latencia_ms, 2),
+            "ultimo_comando": self.ultimo_comando,
+            "camara_visible": self._camera_window_open,
+            "hilos": threading.active_count(),
+            "memoria_mb": round(memoria, 1) if memoria is not None else None,
+            "arranque": self.metricas_arranque,
+            "watchdog": self.watchdog.resumen() if self.watchdog else None
+        }
+
+    def start_processing(self):
+        """Iniciar el procesamiento de video en un thread separado"""
+        with self._control_lock:
+            if not self.running:
+                self.running = True
+                self.paused = False
+                self.video_thread = threading.Thread(target=self.process_video)
+                self.video_thread.daemon = True
+                self.video_thread.start()
+
+    def stop_processing(self):
+        """Detener el procesamiento de video"""
+        with self._control_lock:
+            self.running = False
+            # El thread libera su propia captura y su grafo de MediaPipe al terminar
+            if self.video_thread:
+                self.video_thread.join(timeout=1.0)
+            self.cerrar_ventana_camara()
+
+    def restart_processing(self):
+        """Reiniciar el procesamiento de video para aplicar nueva configuración"""
+        with self._control_lock:
+            self.stop_processing()
+            self.start_processing()
+
+    def pause_processing(self, pausado=None):
+        """Pausar o reanudar la detección (alternar si no se indica)"""
+        self.paused = not self.paused if pausado is None else pausado
+
+    def close(self):
+        """Liberar la cámara y guardar la configuración pendiente"""
+        self.stop_processing()
+        self.config_store.flush()
+
+    def cerrar_ventana_camara(self):
+        """Cerrar la ventana de OpenCV (en modo headless no hay ventanas)"""
+        if self.mostrar_camara:
+            cv2.destroyAllWindows()
+
+    def calcular_angulo(self, a, b, c):
+        """Calcular el ángulo entre tres puntos (b es el vértice)"""
+        ba = np.array([a.x - b.x, a.y - b.y])
+        bc = np.array([c.x - b.x, c.y - b.y])
+
+        coseno_angulo = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
+        # Asegurar que el valor está dentro del rango válido para arccos
+        coseno_angulo = np.clip(coseno_angulo, -1.0, 1.0)
+        angulo = np.arccos(coseno_angulo)
+
+        return np.degrees(angulo)
+
+    def ejecutar_accion(self, accion_clave, parametro=None):
+        """Ejecutar la acción correspondiente"""
+        if accion_clave == "nada":
+            return
+        current_time = self.reloj()
+
+        if accion_clave == "volumen":
+            if parametro < 30:
+                self.pulsar_tecla('volume down')
+                return "BAJAR VOLUMEN"
+            elif parametro > 70:
+                self.pulsar_tecla('volume up')
+                return "SUBIR VOLUMEN"
+            return None
+
+        elif accion_clave == "scroll":
+            # Usar el parámetro de velocidad para controlar la frecuencia de scroll
+            scroll_threshold = 100 - (self.config["VELOCIDAD_SCROLL"] * 80)  # Ajustar el rango
+
+            if parametro < 30:
+                # Solo hacer scroll si ha pasado suficiente tiempo
+                if hasattr(self, 'last_scroll_time'):
+                    if current_time - self.last_scroll_time > (1.1 - self.config["VELOCIDAD_SCROLL"]):
+                        self.pulsar_tecla('page down')
+                        self.last_scroll_time = current_time
+                else:
+                    self.pulsar_tecla('page down')
+                    self.last_scroll_time = current_time
+                return "SCROLL ABAJO"
+            elif parametro > 70:
+                if hasattr(self, 'last_scroll_time'):
+                    if current_time - self.last_scroll_time > (1.1 - self.config["VELOCIDAD_SCROLL"]):
+                        self.pulsar_tecla('page up')
+                        self.last_scroll_time = current_time
+                else:
+                    self.pulsar_tecla('page up')
+                    self.last_scroll_time = current_time
+                return "SCROLL ARRIBA"
+            return None
+
+
+        elif accion_clave in ACCIONES and ACCIONES[accion_clave]["tecla"]:
+            self.pulsar_tecla(ACCIONES[accion_clave]["tecla"])
+            return ACCIONES[accion_clave]["nombre"].upper()
+
+        return None
+
+    def pulsar_tecla(self, tecla):
+        """Enviar la pulsación de una tecla al sistema"""
+        keyboard.press_and_release(tecla)
+
+    def toggle_camera_window(self):
+        """Alternar la visibilidad de la ventana de cámara"""
+        if not self.mostrar_camara:
+            raise RuntimeError("La ventana de cámara no está disponible en modo headless")
+        with self._camera_lock:
+            self._camera_window_open = not self._camera_window_open
+            if not self._camera_window_open:
+                cv2.destroyAllWindows()
+
+    def procesando(self):
+        """Indicar si el thread actual debe seguir procesando
+
+        Tras un reinicio cuyo join expiró, el thread anterior deja de ser el actual
+        y termina por su cuenta sin tocar el estado del nuevo.
+        """
+        return self.running and self.video_thread is threading.current_thread()
+
+    def process_video(self):
+        """Procesar video para detectar gestos"""
+        # Captura y grafo propios de este thread (no se comparten entre reinicios)
+        cap = None
+        hands = None
+        try:
+            cap = cv2.VideoCapture(self.fuente_video)
+            hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=1,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.5
+            )
+
+            gesto_actual = None
+            t_frame_anterior = None
+
+            while self.procesando() and cap.isOpened():
+                success, image = cap.read()
+                if not success:
+                    # Al terminar un video grabado, volver a empezar
+                    if isinstance(self.fuente_video, str):
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+
+                # Actualizar estadísticas (media móvil de fps)
+                t_frame = time.perf_counter()
+                if t_frame_anterior is not None and t_frame > t_frame_anterior:
+                    self.fps = 0.9 * self.fps + 0.1 / (t_frame - t_frame_anterior)
+                t_frame_anterior = t_frame
+                self.frames_procesados += 1
+
+                # Procesar solo si no está pausado
+                if not self.paused:
+                    # Convertir imagen a RGB para MediaPipe
+                    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                    results = hands.process(image_rgb)
+                    gesto_actual = None
+
+                    if results.multi_hand_landmarks:
+                        hand_landmarks = results.multi_hand_landmarks[0]
+                        indice = hand_landmarks.landmark[8]  # Punta del dedo índice
+                        pulgar = hand_landmarks.landmark[4]  # Punta del dedo pulgar
+                        mcp_indice = hand_landmarks.landmark[5]  # Base del dedo índice
+                        wrist = hand_landmarks.landmark[0]  # Muñeca
+
+                        # Calcular distancia entre pulgar e índice
+                        distancia = np.linalg.norm([indice.x - pulgar.x, indice.y - pulgar.y])
+                        tiempo_actual = self.reloj()
+
+                        # Calcular ángulo entre pulgar, muñeca e índice
+                        angulo_pulgar = self.calcular_angulo(pulgar, wrist, indice)
+
+                        # Lógica de gestos con anti-rebote
+                        if self.cambio_listo:
+                            # Gesto 1: Pulgar e índice muy cercanos (PAUSA)
+                            if distancia < self.config["UMBRAL_PAUSA"]:
+                                accion = self.config["GESTOS_ACCIONES"]["pulgar_indice_cerca"]
+                                gesto_actual = self.ejecutar_accion(accion)
+                                self.cambio_listo = False
+                                self.ultimo_gesto = tiempo_actual
+                                
+                                # Mostrar "PAUSA" en rojo cuando se detecta el gesto
+                                if accion == "play_pause":
+                                    # Obtener dimensiones de la imagen
+                                    height, width = image.shape[:2]
+                                    # Calcular posición central
+                                    text = "PAUSA"
+                                    font = cv2.FONT_HERSHEY_SIMPLEX
+                                    font_scale = 2
+                                    thickness = 3
+                                    # Obtener tamaño del texto
+                                    (text_width, text_height), _ = cv2.getTextSize(text, font, font_scale, thickness)
+                                    # Calcular posición para centrar el texto
+                                    text_x = (width - text_width) // 2
+                                    text_y = (height + text_height) // 2
+                                    # Dibujar el texto en rojo
+                                    cv2.putText(image, text, (text_x, text_y), font, font_scale, (0, 0, 255), thickness)
+
+                            # Gesto 2 y 3: Ángulo grande (izquierda o derecha)
+                            elif angulo_pulgar > self.config["UMBRAL_ANGULO_CANCION"]:
+                                invertir = self.config["INVERTIR_DIRECCION_CANCION"]
+                                if indice.x < wrist.x:
+                                    accion = self.config["GESTOS_ACCIONES"]["angulo_grande_" + ("derecha" if invertir else "izquierda")]
+                                else:
+                                    accion = self.config["GESTOS_ACCIONES"]["angulo_grande_" + ("izquierda" if invertir else "derecha")]
+                                gesto_actual = self.ejecutar_accion(accion)
+                                self.cambio_listo = False
+                                self.ultimo_gesto = tiempo_actual
+
+                            # Gesto 4: Ángulo pequeño con distancia variable (volumen u otro)
+                            elif angulo_pulgar <= self.config["UMBRAL_ANGULO_VOLUMEN"] and distancia >= self.config["UMBRAL_PAUSA"]:
+                                accion = self.config["GESTOS_ACCIONES"]["angulo_pequeno_distancia"]
+                                if accion == "volumen":
+                                    vol = np.interp(
+                                        distancia,
+                                        [self.config["DISTANCIA_MIN_VOL"], self.config["DISTANCIA_MAX_VOL"]],
+                                        [0, 100]
+                                    )
+                                    gesto_actual = self.ejecutar_accion("volumen", vol)
+                                elif accion == "scroll":
+                                    scroll_pos = np.interp(
+                                        indice.x,
+                                        [wrist.x - 0.2, wrist.x + 0.2],
+                                        [0, 100]
+                                    )
+                                    gesto_actual = self.ejecutar_accion("scroll", scroll_pos)
+                                else:
+                                    gesto_actual = self.ejecutar_accion(accion)
+                                    if accion != "nada":
+                                        self.cambio_listo = False
+                                        self.ultimo_gesto = tiempo_actual
+
+                        # Reactivar después del tiempo de espera
+                        if not self.cambio_listo and (tiempo_actual - self.ultimo_gesto) > self.config["TIEMPO_ENTRE_ACCIONES"]:
+                            self.cambio_listo = True
+
+                        # Dibujar landmarks y ángulo
+                        self.mp_drawing.draw_landmarks(image, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+
+                        # Mostrar ángulo
+                        cv2.putText(image, f"Angulo: {angulo_pulgar:.1f}°",
+                                    (int(wrist.x * image.shape[1]), int(wrist.y * image.shape[0])),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+
+                        # Mostrar estado del control de volumen
+                        if angulo_pulgar <= self.config["UMBRAL_ANGULO_VOLUMEN"]:
+                            vol_status = "ACTIVO" if self.config["GESTOS_ACCIONES"][
+                                                         "angulo_pequeno_distancia"] == "volumen" else "INACTIVO"
+                            color = (0, 255, 0) if vol_status == "ACTIVO" else (0, 0, 255)
+
+                            cv2.putText(image, f"Control de volumen: {vol_status}", (10, 150),
+                                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+
+                # Mostrar "PAUSA" en rojo cuando está pausado
+                if self.paused:
+                    # Obtener dimensiones de la imagen
+                    height, width = image.shape[:2]
+                    # Calcular posición central
+                    text = "PAUSA"
+                    font = cv2.FONT_HERSHEY_SIMPLEX
+                    font_scale = 2
+                    thickness = 3
+                    # Obtener tamaño del texto
+                    (text_width, text_height), _ = cv2.getTextSize(text, font, font_scale, thickness)
+                    # Calcular posición para centrar el texto
+                    text_x = (width - text_width) // 2
+                    text_y = (height + text_height) // 2
+                    # Dibujar el texto en rojo
+                    cv2.putText(image, text, (text_x, text_y), font, font_scale, (0, 0, 255), thickness)
+
+                if gesto_actual:
+                    self.ultimo_comando = gesto_actual
+
+                # Mostrar información
+                cv2.putText(image, f"Ultimo comando: {gesto_actual if gesto_actual else 'Ninguno'}", (10, 50),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                cv2.putText(
+                    image,
+                    f"Tiempo restante: {max(0, self.config['TIEMPO_ENTRE_ACCIONES'] - (self.reloj() - self.ultimo_gesto)):.1f}s",
+                    (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2
+                )
+
+                # Mostrar controles
+                cv2.putText(image, "Presiona 'q' para cerrar, 'p' para pausar", (10, image.shape[0] - 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+                # Latencia por frame procesado (media móvil) para detectar degradación; se mide
+                # antes de imshow/waitKey para no depender de si la ventana está abierta. El
+                # primer frame la inicializa, para que el watchdog no tome una base casi nula
+                if not self.paused:
+                    medida = (time.perf_counter() - t_frame) * 1000
+                    self.latencia_ms = 0.9 * self.latencia_ms + 0.1 * medida if self.latencia_ms else medida
+
+                # Solo mostrar la ventana si está configurada para estar abierta
+                with self._camera_lock:
+                    if self._camera_window_open:
+                        cv2.imshow('Control por Gestos', image)
+                        key = cv2.waitKey(1) & 0xFF
+
+                        if key == ord('q'):
+                            # En lugar de cerrar, minimizar a la bandeja
+                            self._camera_window_open = False
+                            cv2.destroyAllWindows()
+                        elif key == ord('p'):
+                            self.paused = not self.paused
+
+        except Exception as e:
+            print(f"Error en procesamiento de video: {e}")
+        finally:
+            if hands:
+                hands.close()
+            if cap:
+                cap.release()
+            # Si ya hay otro thread procesando, la ventana y el estado son suyos
+            if self.video_thread is threading.current_thread():
+                self.cerrar_ventana_camara()
+                self.running = False
+
+
+class ControlHandler(socketserver.StreamRequestHandler):
+    """Atender comandos de texto del socket de control, uno por línea"""
+
+    def handle(self):
+        for linea in self.rfile:
+            comando, _, argumento = linea.decode("utf-8").strip().partition(" ")
+            if not comando:
+                continue
+            if comando.lower() == "watch":
+                self.vigilar(argumento.strip())
+                return
+            try:
+                respuesta = "OK " + json.dumps(self.server.ejecutar(comando.lower(), argumento.strip()))
+            except Exception as e:
+                respuesta = "ERR " + str(e).replace("\n", " ")
+            self.wfile.write((respuesta + "\n").encode("utf-8"))
+
+    def vigilar(self, argumento):
+        """Enviar "EVENT <diff>" por cada cambio de configuración hasta que el cliente cierre"""
+        cambios = queue.Queue()
+        try:
+            claves = ConfigStore.validar_claves(json.loads(argumento) if argumento else None)
+            self.server.motor.subscribe(cambios.put, claves)
+        except ValueError as e:
+            self.wfile.write(f"ERR {e}\n".encode("utf-8"))
+            return
+
+        try:
+            self.wfile.write(b'OK "watch"\n')
+            while True:
+                try:
+                    diff = cambios.get(timeout=1.0)
+                except queue.Empty:
+                    # Sin cambios: terminar si el cliente cerró la conexión (EOF)
+                    legible, _, _ = select.select([self.request], [], [], 0)
+                    if legible and not self.request.recv(1024):
+                        break
+                    continue
+                self.wfile.write(("EVENT " + json.dumps(diff) + "\n").encode("utf-8"))
+        except OSError:
+            pass  # El cliente cerró la conexión
+        finally:
+            self.server.motor.unsubscribe(cambios.put)
+
+
+class ControlServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Socket de dominio Unix para controlar un GestureEngine desde otro proceso
+
+    Protocolo: el cliente envía "<comando> [argumento]\\n" y recibe una línea
+    "OK <json>" o "ERR <mensaje>". Tras "watch [claves]" la conexión solo recibe
+    líneas "EVENT <diff>" con cada cambio de configuración.
+    """
+
+    # Equivale a socketserver.UnixStreamServer, que no existe en Windows
+    address_family = getattr(socket, "AF_UNIX", None)
+    daemon_threads = True
+
+    def __init__(self, motor, ruta=SOCKET_FILE):
+        if self.address_family is None:
+            raise RuntimeError("Los sockets de dominio Unix no están disponibles en esta plataforma")
+        self.motor = motor
+        self.ruta = ruta
+        self.liberar_ruta()
+        super().__init__(ruta, ControlHandler)
+        os.chmod(ruta, 0o600)
+
+        self.comandos = {
+            "ping": lambda arg: "pong",
+            "start": lambda arg: self.motor.start_processing(),
+            "stop": lambda arg: self.motor.stop_processing(),
+            "pause": lambda arg: self.motor.pause_processing(True),
+            "resume": lambda arg: self.motor.pause_processing(False),
+            "reload": lambda arg: self.motor.reload_config(),
+            "camera": lambda arg: self.motor.toggle_camera_window(),
+            "set": lambda arg: self.motor.update_config(json.loads(arg)),
+            "reset": lambda arg: self.motor.reset_config(),
+            "save": lambda arg: self.motor.save_config(),
+            "config": lambda arg: self.motor.get_config(),
+            "stats": lambda arg: self.motor.get_stats(),
+            "quit": lambda arg: threading.Thread(target=self.shutdown, daemon=True).start()
+        }
+
+    def liberar_ruta(self):
+        """Eliminar un socket huérfano de una ejecución anterior"""
+        if not os.path.exists(self.ruta):
+            return
+        prueba = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            prueba.connect(self.ruta)
+        except OSError:
+            os.unlink(self.ruta)
+        else:
+            raise RuntimeError(f"Ya hay una instancia escuchando en {self.ruta}")
+        finally:
+            prueba.close()
+
+    def ejecutar(self, comando, argumento):
+        """Ejecutar un comando y devolver su resultado (o las estadísticas)"""
+        if comando not in self.comandos:
+            raise ValueError(f"Comando desconocido: {comando} (disponibles: {', '.join(self.comandos)})")
+        resultado = self.comandos[comando](argumento)
+        return self.motor.get_stats() if resultado is None else resultado
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.ruta):
+            os.unlink(self.ruta)
+
+
+class ControlClient:
+    """Cliente del socket de control con la misma interfaz que GestureEngine"""
+
+    # El motor remoto corre en modo headless, sin ventana de cámara
+    mostrar_camara = False
+
+    def __init__(self, ruta=SOCKET_FILE):
+        self.ruta = ruta
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(ruta)
+        self.archivo = self.sock.makefile("rwb")
+        self._lock = threading.Lock()
+        self._vigilancias = []
+
+    def enviar(self, comando, argumento=None):
+        """Enviar un comando y devolver la respuesta decodificada"""
+        linea = comando if argumento is None else f"{comando} {argumento}"
+        with self._lock:
+            self.archivo.write((linea + "\n").encode("utf-8"))
+            self.archivo.flush()
+            respuesta = self.archivo.readline().decode("utf-8").strip()
+        estado, _, datos = respuesta.partition(" ")
+        if estado != "OK":
+            raise RuntimeError(datos or "El servidor cerró la conexión")
+        return json.loads(datos)
+
+    @property
+    def running(self):
+        return self.get_stats()["running"]
+
+    def start_processing(self):
+        self.enviar("start")
+
+    def stop_processing(self):
+        self.enviar("stop")
+
+    def pause_processing(self, pausado=None):
+        if pausado is None:
+            pausado = not self.get_stats()["paused"]
+        self.enviar("pause" if pausado else "resume")
+
+    def save_config(self):
+        self.enviar("save")
+
+    def update_config(self, cambios):
+        return self.enviar("set", json.dumps(cambios))
+
+    def reset_config(self):
+        return self.enviar("reset")
+
+    def reload_config(self):
+        return self.enviar("reload")
+
+    def subscribe(self, callback, claves=None):
+        """Recibir en un thread los cambios de configuración del proceso headless"""
+        claves = ConfigStore.validar_claves(claves)
+        conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conexion.connect(self.ruta)
+        archivo = conexion.makefile("rwb")
+        linea = "watch" if claves is None else "watch " + json.dumps(list(claves))
+        archivo.write((linea + "\n").encode("utf-8"))
+        archivo.flush()
+        estado, _, datos = archivo.readline().decode("utf-8").strip().partition(" ")
+        if estado != "OK":
+            conexion.close()
+            raise RuntimeError(datos or "El servidor cerró la conexión")
+
+        self._vigilancias.append(conexion)
+        threading.Thread(target=self._escuchar, args=(archivo, callback), daemon=True).start()
+
+    def _escuchar(self, archivo, callback):
+        try:
+            for linea in archivo:
+                evento, _, datos = linea.decode("utf-8").strip().partition(" ")
+                if evento == "EVENT":
+                    callback({clave: tuple(valores) for clave, valores in json.loads(datos).items()})
+        except (OSError, ValueError):
+            pass
+
+    def get_config(self):
+        return self.enviar("config")
+
+    def get_stats(self):
+        return self.enviar("stats")
+
+    def toggle_camera_window(self):
+        self.enviar("camera")
+
+    def close(self):
+        """Cerrar la conexión sin detener el proceso headless"""
+        for conexion in self._vigilancias:
+            try:
+                conexion.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conexion.close()
+        self.archivo.close()
+        self.sock.close()
+
+
+class GestureController:
+    """Interfaz gráfica y bandeja del sistema sobre un GestureEngine o un ControlClient"""
+
+    def __init__(self, motor):
+        # Motor local o cliente del socket de control (misma interfaz)
+        self.motor = motor
+        self.config = motor.get_config()
+
+        # Variables de control
+        self.window_visible = False
+
         # Crear ventana principal con CustomTkinter
         self.root = ctk.CTk()
         self.root.title("Control por Gestos")
         self.root.protocol("WM_DELETE_WINDOW", self.minimize_to_tray)
         self.root.withdraw()  # Ocultar ventana al inicio
 
-        # Configurar interfaz de usuario
-        self.setup_ui()
-
-        # Configurar icono en la bandeja del sistema
-        self.setup_tray()
-
-        # Iniciar thread para procesamiento de video
-        self.video_thread = None
-
-        # Añadir variables para control de la ventana
-        self._camera_window_open = True
-        self._camera_lock = threading.Lock()
+        # Configurar interfaz de usuario
+        self.setup_ui()
 
-    def load_config(self):
-        """Cargar configuración desde archivo o usar valores por defecto"""
-        try:
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r') as f:
-                    self.config = json.load(f)
-                for key, value in DEFAULT_CONFIG.items():
-                    if key not in self.config:
-                        self.config[key] = value
-            else:
-                self.config = DEFAULT_CONFIG.copy()
-            self.save_config()
-        except Exception as e:
-            print(f"Error al cargar configuración: {e}")
-            self.config = DEFAULT_CONFIG.copy()
+        # Reflejar en los controles los cambios hechos por otros (socket, recarga)
+        self.motor.subscribe(self.on_config_change)
 
-    def save_config(self):
-        """Guardar configuración actual a archivo"""
-        try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(self.config, f, indent=4)
-        except Exception as e:
-            print(f"Error al guardar configuración: {e}")
+        # Configurar icono en la bandeja del sistema
+        self.setup_tray()
 
     def setup_ui(self):
         """Configurar interfaz de usuario moderna con CustomTkinter"""
@@ -224,7 +1069,8 @@ class GestureController:
                 from_=min_val,
                 to=max_val,
                 number_of_steps=int((max_val - min_val) / step),
-                variable=self.param_vars[param]
+                variable=self.param_vars[param],
+                command=partial(self.on_param_change, param)
             )
             slider.pack(side="left", fill="x", expand=True, padx=5)
 
@@ -246,7 +1092,8 @@ class GestureController:
             text="Invertir dirección para cambio de canción",
             variable=self.invertir_var,
             onvalue=True,
-            offvalue=False
+            offvalue=False,
+            command=lambda: self.aplicar_cambios({"INVERTIR_DIRECCION_CANCION": self.invertir_var.get()})
         )
         self.invertir_check.pack(anchor="w", padx=5, pady=5)
 
@@ -291,7 +1138,8 @@ class GestureController:
                 variable=self.gesto_vars[gesto],
                 values=[accion["nombre"] for accion in ACCIONES.values()],
                 state="readonly",
-                width=200
+                width=200,
+                command=partial(self.on_gesto_change, gesto)
             )
             combo.set(nombre_accion_actual)
             combo.pack(side="left", padx=5, pady=5)
@@ -299,33 +1147,46 @@ class GestureController:
             # Mapear nombre de acción a clave
             self.accion_a_clave = {accion["nombre"]: clave for clave, accion in ACCIONES.items()}
 
-    def save_ui_config(self):
-        """Guardar la configuración desde la UI al archivo"""
+    def aplicar_cambios(self, cambios):
+        """Aplicar en caliente un cambio hecho en la UI (se guarda de forma diferida)"""
         try:
-            # Actualizar configuración desde variables de UI
-            for param, var in self.param_vars.items():
-                self.config[param] = var.get()
-
-            self.config["INVERTIR_DIRECCION_CANCION"] = self.invertir_var.get()
-
-            # Actualizar mapeo de gestos
-            for gesto, var in self.gesto_vars.items():
-                nombre_accion = var.get()
-                for clave, accion in ACCIONES.items():
-                    if accion["nombre"] == nombre_accion:
-                        self.config["GESTOS_ACCIONES"][gesto] = clave
-                        break
+            self.motor.update_config(cambios)
+        except Exception as e:
+            self.status_bar.configure(text=f"Error al aplicar: {str(e)}", text_color="#ff3333")
+            self.root.after(3000, lambda: self.status_bar.configure(text="Estado: Error", text_color="#ff3333"))
 
-            # Guardar en archivo
-            self.save_config()
+    def on_param_change(self, param, valor):
+        """Aplicar el valor de un slider mientras se mueve"""
+        self.aplicar_cambios({param: valor})
+
+    def on_gesto_change(self, gesto, nombre_accion):
+        """Aplicar la acción elegida para un gesto"""
+        self.aplicar_cambios({"GESTOS_ACCIONES": {gesto: self.accion_a_clave[nombre_accion]}})
+
+    def on_config_change(self, diff):
+        """Recibir cambios de configuración (puede llegar desde otro thread)"""
+        self.root.after(0, self.refrescar_controles, diff)
+
+    def refrescar_controles(self, diff):
+        """Actualizar los controles con los valores que cambiaron"""
+        for clave, (_, nuevo) in diff.items():
+            self.config[clave] = nuevo
+            if clave in self.param_vars:
+                self.param_vars[clave].set(nuevo)
+            elif clave == "INVERTIR_DIRECCION_CANCION":
+                self.invertir_var.set(nuevo)
+            elif clave == "GESTOS_ACCIONES":
+                for gesto, var in self.gesto_vars.items():
+                    var.set(ACCIONES[nuevo[gesto]]["nombre"])
+
+    def save_ui_config(self):
+        """Guardar ya en el archivo la configuración aplicada desde la UI"""
+        try:
+            self.motor.save_config()
 
             # Actualizar estado
             self.status_bar.configure(text="Configuración guardada correctamente", text_color="#2e8b57")
 
-            # Si el procesamiento está en curso, reiniciar para aplicar la nueva configuración
-            if self.running:
-                self.restart_processing()
-
             # Temporizador para limpiar el mensaje
             self.root.after(3000, lambda: self.status_bar.configure(text="Estado: Listo", text_color="white"))
 
@@ -336,26 +1197,12 @@ class GestureController:
     def reset_config(self):
         """Restaurar configuración por defecto"""
         if messagebox.askyesno("Restaurar valores", "¿Está seguro de restaurar la configuración por defecto?"):
-            self.config = DEFAULT_CONFIG.copy()
-            self.save_config()
-
-            # Actualizar UI
-            for param, var in self.param_vars.items():
-                var.set(self.config[param])
-
-            self.invertir_var.set(self.config["INVERTIR_DIRECCION_CANCION"])
-
-            for gesto, var in self.gesto_vars.items():
-                accion = self.config["GESTOS_ACCIONES"][gesto]
-                var.set(ACCIONES[accion]["nombre"])
+            # Los controles se actualizan al recibir la notificación del cambio
+            self.motor.reset_config()
 
             # Actualizar estado
             self.status_bar.configure(text="Configuración restaurada a valores predeterminados", text_color="#2e8b57")
 
-            # Reiniciar procesamiento si está en curso
-            if self.running:
-                self.restart_processing()
-
             # Temporizador para limpiar el mensaje
             self.root.after(3000, lambda: self.status_bar.configure(text="Estado: Listo", text_color="white"))
 
@@ -388,8 +1235,11 @@ class GestureController:
 
         menu = (
             pystray.MenuItem('Mostrar/Ocultar Config', self.toggle_window),
-            pystray.MenuItem('Mostrar/Ocultar Cámara', self.toggle_camera_window),
+            # La cámara solo se puede mostrar si el motor corre en este proceso
+            pystray.MenuItem('Mostrar/Ocultar Cámara', self.toggle_camera_window,
+                             visible=self.motor.mostrar_camara),
             pystray.MenuItem('Iniciar/Detener', self.toggle_processing),
+            pystray.MenuItem('Pausar/Reanudar', self.toggle_pause),
             pystray.MenuItem('Salir', self.quit_app)
         )
 
@@ -417,284 +1267,32 @@ class GestureController:
 
     def toggle_processing(self):
         """Iniciar o detener el procesamiento de video"""
-        if self.running:
-            self.stop_processing()
+        if self.motor.running:
+            self.motor.stop_processing()
             self.status_bar.configure(text="Procesamiento detenido", text_color="#ff3333")
         else:
-            self.start_processing()
+            self.motor.start_processing()
             self.status_bar.configure(text="Procesamiento iniciado", text_color="#2e8b57")
 
         # Temporizador para limpiar el mensaje
         self.root.after(3000, lambda: self.status_bar.configure(text="Estado: Listo", text_color="white"))
 
-    def start_processing(self):
-        """Iniciar el procesamiento de video en un thread separado"""
-        if not self.running:
-            self.running = True
-            self.paused = False
-            self.video_thread = threading.Thread(target=self.process_video)
-            self.video_thread.daemon = True
-            self.video_thread.start()
-
-    def stop_processing(self):
-        """Detener el procesamiento de video"""
-        self.running = False
-        if self.video_thread:
-            self.video_thread.join(timeout=1.0)
-        if self.cap:
-            self.cap.release()
-            self.cap = None
-        cv2.destroyAllWindows()
+    def toggle_pause(self):
+        """Pausar o reanudar la detección de gestos"""
+        self.motor.pause_processing()
 
-    def restart_processing(self):
-        """Reiniciar el procesamiento de video para aplicar nueva configuración"""
-        self.stop_processing()
-        self.start_processing()
+    def toggle_camera_window(self):
+        """Alternar la visibilidad de la ventana de cámara"""
+        if self.motor.mostrar_camara:
+            self.motor.toggle_camera_window()
 
     def quit_app(self):
-        """Salir de la aplicación"""
-        self.stop_processing()
+        """Salir de la aplicación (en modo cliente el proceso headless sigue activo)"""
+        self.motor.close()
         self.icon.stop()
         self.root.quit()
         self.root.destroy()
 
-    def calcular_angulo(self, a, b, c):
-        """Calcular el ángulo entre tres puntos (b es el vértice)"""
-        ba = np.array([a.x - b.x, a.y - b.y])
-        bc = np.array([c.x - b.x, c.y - b.y])
-
-        coseno_angulo = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-        # Asegurar que el valor está dentro del rango válido para arccos
-        coseno_angulo = np.clip(coseno_angulo, -1.0, 1.0)
-        angulo = np.arccos(coseno_angulo)
-
-        return np.degrees(angulo)
-
-    def ejecutar_accion(self, accion_clave, parametro=None):
-        """Ejecutar la acción correspondiente"""
-        if accion_clave == "nada":
-            return
-        current_time = time.time()
-
-        if accion_clave == "volumen":
-            if parametro < 30:
-                keyboard.press_and_release('volume down')
-                return "BAJAR VOLUMEN"
-            elif parametro > 70:
-                keyboard.press_and_release('volume up')
-                return "SUBIR VOLUMEN"
-            return None
-
-        elif accion_clave == "scroll":
-            # Usar el parámetro de velocidad para controlar la frecuencia de scroll
-            scroll_threshold = 100 - (self.config["VELOCIDAD_SCROLL"] * 80)  # Ajustar el rango
-
-            if parametro < 30:
-                # Solo hacer scroll si ha pasado suficiente tiempo
-                if hasattr(self, 'last_scroll_time'):
-                    if current_time - self.last_scroll_time > (1.1 - self.config["VELOCIDAD_SCROLL"]):
-                        keyboard.press_and_release('page down')
-                        self.last_scroll_time = current_time
-                else:
-                    keyboard.press_and_release('page down')
-                    self.last_scroll_time = current_time
-                return "SCROLL ABAJO"
-            elif parametro > 70:
-                if hasattr(self, 'last_scroll_time'):
-                    if current_time - self.last_scroll_time > (1.1 - self.config["VELOCIDAD_SCROLL"]):
-                        keyboard.press_and_release('page up')
-                        self.last_scroll_time = current_time
-                else:
-                    keyboard.press_and_release('page up')
-                    self.last_scroll_time = current_time
-                return "SCROLL ARRIBA"
-            return None
-
-
-        elif accion_clave in ACCIONES and ACCIONES[accion_clave]["tecla"]:
-            keyboard.press_and_release(ACCIONES[accion_clave]["tecla"])
-            return ACCIONES[accion_clave]["nombre"].upper()
-
-        return None
-
-    def toggle_camera_window(self):
-        """Alternar la visibilidad de la ventana de cámara"""
-        with self._camera_lock:
-            self._camera_window_open = not self._camera_window_open
-            if not self._camera_window_open:
-                cv2.destroyAllWindows()
-
-    def process_video(self):
-        """Procesar video para detectar gestos"""
-        try:
-            self.cap = cv2.VideoCapture(0)
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=1,
-                min_detection_confidence=0.7,
-                min_tracking_confidence=0.5
-            )
-
-            while self.running and self.cap.isOpened():
-                success, image = self.cap.read()
-                if not success:
-                    continue
-
-                # Procesar solo si no está pausado
-                if not self.paused:
-                    # Convertir imagen a RGB para MediaPipe
-                    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                    results = self.hands.process(image_rgb)
-                    gesto_actual = None
-
-                    if results.multi_hand_landmarks:
-                        hand_landmarks = results.multi_hand_landmarks[0]
-                        indice = hand_landmarks.landmark[8]  # Punta del dedo índice
-                        pulgar = hand_landmarks.landmark[4]  # Punta del dedo pulgar
-                        mcp_indice = hand_landmarks.landmark[5]  # Base del dedo índice
-                        wrist = hand_landmarks.landmark[0]  # Muñeca
-
-                        # Calcular distancia entre pulgar e índice
-                        distancia = np.linalg.norm([indice.x - pulgar.x, indice.y - pulgar.y])
-                        tiempo_actual = time.time()
-
-                        # Calcular ángulo entre pulgar, muñeca e índice
-                        angulo_pulgar = self.calcular_angulo(pulgar, wrist, indice)
-
-                        # Lógica de gestos con anti-rebote
-                        if self.cambio_listo:
-                            # Gesto 1: Pulgar e índice muy cercanos (PAUSA)
-                            if distancia < self.config["UMBRAL_PAUSA"]:
-                                accion = self.config["GESTOS_ACCIONES"]["pulgar_indice_cerca"]
-                                gesto_actual = self.ejecutar_accion(accion)
-                                self.cambio_listo = False
-                                self.ultimo_gesto = tiempo_actual
-                                
-                                # Mostrar "PAUSA" en rojo cuando se detecta el gesto
-                                if accion == "play_pause":
-                                    # Obtener dimensiones de la imagen
-                                    height, width = image.shape[:2]
-                                    # Calcular posición central
-                                    text = "PAUSA"
-                                    font = cv2.FONT_HERSHEY_SIMPLEX
-                                    font_scale = 2
-                                    thickness = 3
-                                    # Obtener tamaño del texto
-                                    (text_width, text_height), _ = cv2.getTextSize(text, font, font_scale, thickness)
-                                    # Calcular posición para centrar el texto
-                                    text_x = (width - text_width) // 2
-                                    text_y = (height + text_height) // 2
-                                    # Dibujar el texto en rojo
-                                    cv2.putText(image, text, (text_x, text_y), font, font_scale, (0, 0, 255), thickness)
-
-                            # Gesto 2 y 3: Ángulo grande (izquierda o derecha)
-                            elif angulo_pulgar > self.config["UMBRAL_ANGULO_CANCION"]:
-                                invertir = self.config["INVERTIR_DIRECCION_CANCION"]
-                                if indice.x < wrist.x:
-                                    accion = self.config["GESTOS_ACCIONES"]["angulo_grande_" + ("derecha" if invertir else "izquierda")]
-                                else:
-                                    accion = self.config["GESTOS_ACCIONES"]["angulo_grande_" + ("izquierda" if invertir else "derecha")]
-                                gesto_actual = self.ejecutar_accion(accion)
-                                self.cambio_listo = False
-                                self.ultimo_gesto = tiempo_actual
-
-                            # Gesto 4: Ángulo pequeño con distancia variable (volumen u otro)
-                            elif angulo_pulgar <= self.config["UMBRAL_ANGULO_VOLUMEN"] and distancia >= self.config["UMBRAL_PAUSA"]:
-                                accion = self.config["GESTOS_ACCIONES"]["angulo_pequeno_distancia"]
-                                if accion == "volumen":
-                                    vol = np.interp(
-                                        distancia,
-                                        [self.config["DISTANCIA_MIN_VOL"], self.config["DISTANCIA_MAX_VOL"]],
-                                        [0, 100]
-                                    )
-                                    gesto_actual = self.ejecutar_accion("volumen", vol)
-                                elif accion == "scroll":
-                                    scroll_pos = np.interp(
-                                        indice.x,
-                                        [wrist.x - 0.2, wrist.x + 0.2],
-                                        [0, 100]
-                                    )
-                                    gesto_actual = self.ejecutar_accion("scroll", scroll_pos)
-                                else:
-                                    gesto_actual = self.ejecutar_accion(accion)
-                                    if accion != "nada":
-                                        self.cambio_listo = False
-                                        self.ultimo_gesto = tiempo_actual
-
-                        # Reactivar después del tiempo de espera
-                        if not self.cambio_listo and (tiempo_actual - self.ultimo_gesto) > self.config["TIEMPO_ENTRE_ACCIONES"]:
-                            self.cambio_listo = True
-
-                        # Dibujar landmarks y ángulo
-                        self.mp_drawing.draw_landmarks(image, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-
-                        # Mostrar ángulo
-                        cv2.putText(image, f"Angulo: {angulo_pulgar:.1f}°",
-                                    (int(wrist.x * image.shape[1]), int(wrist.y * image.shape[0])),
-                                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-
-                        # Mostrar estado del control de volumen
-                        if angulo_pulgar <= self.config["UMBRAL_ANGULO_VOLUMEN"]:
-                            vol_status = "ACTIVO" if self.config["GESTOS_ACCIONES"][
-                                                         "angulo_pequeno_distancia"] == "volumen" else "INACTIVO"
-                            color = (0, 255, 0) if vol_status == "ACTIVO" else (0, 0, 255)
-
-                            cv2.putText(image, f"Control de volumen: {vol_status}", (10, 150),
-                                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-
-                # Mostrar "PAUSA" en rojo cuando está pausado
-                if self.paused:
-                    # Obtener dimensiones de la imagen
-                    height, width = image.shape[:2]
-                    # Calcular posición central
-                    text = "PAUSA"
-                    font = cv2.FONT_HERSHEY_SIMPLEX
-                    font_scale = 2
-                    thickness = 3
-                    # Obtener tamaño del texto
-                    (text_width, text_height), _ = cv2.getTextSize(text, font, font_scale, thickness)
-                    # Calcular posición para centrar el texto
-                    text_x = (width - text_width) // 2
-                    text_y = (height + text_height) // 2
-                    # Dibujar el texto en rojo
-                    cv2.putText(image, text, (text_x, text_y), font, font_scale, (0, 0, 255), thickness)
-
-                # Mostrar información
-                cv2.putText(image, f"Ultimo comando: {gesto_actual if gesto_actual else 'Ninguno'}", (10, 50),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-                cv2.putText(
-                    image,
-                    f"Tiempo restante: {max(0, self.config['TIEMPO_ENTRE_ACCIONES'] - (time.time() - self.ultimo_gesto)):.1f}s",
-                    (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2
-                )
-
-                # Mostrar controles
-                cv2.putText(image, "Presiona 'q' para cerrar, 'p' para pausar", (10, image.shape[0] - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-
-                # Solo mostrar la ventana si está configurada para estar abierta
-                with self._camera_lock:
-                    if self._camera_window_open:
-                        cv2.imshow('Control por Gestos', image)
-                        key = cv2.waitKey(1) & 0xFF
-
-                        if key == ord('q'):
-                            # En lugar de cerrar, minimizar a la bandeja
-                            self._camera_window_open = False
-                            cv2.destroyAllWindows()
-                        elif key == ord('p'):
-                            self.paused = not self.paused
-
-        except Exception as e:
-            print(f"Error en procesamiento de video: {e}")
-        finally:
-            if self.hands:
-                self.hands.close()
-            if self.cap:
-                self.cap.release()
-            cv2.destroyAllWindows()
-            self.running = False
-
     def on_icon_click(self, icon, button):
         """Manejar clic en el icono"""
         if str(button) == "Button.left":
@@ -706,7 +1304,93 @@ class GestureController:
         self.toggle_camera_window()
 
 
+def parse_args(argv=None):
+    """Leer las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Control multimedia por gestos con la cámara web")
+    parser.add_argument("--headless", action="store_true",
+                        help="ejecutar sin interfaz gráfica ni bandeja; control por socket")
+    parser.add_argument("--socket", metavar="RUTA", nargs="?", const=SOCKET_FILE,
+                        help=f"exponer el socket de control (por defecto {SOCKET_FILE}; siempre activo con --headless)")
+    parser.add_argument("--connect", metavar="RUTA", nargs="?", const=SOCKET_FILE,
+                        help="abrir la interfaz como cliente de un proceso --headless")
+    parser.add_argument("--video", metavar="RUTA",
+                        help="procesar un video grabado (en bucle) en lugar de la cámara")
+    parser.add_argument("--watchdog", metavar="SEGUNDOS", type=float, nargs="?", const=60.0,
+                        help="vigilar memoria, hilos, descriptores y latencia cada SEGUNDOS (60 por defecto)")
+    parser.add_argument("--max-memoria-mb", type=float, default=64.0,
+                        help="crecimiento máximo de memoria residente (con --watchdog)")
+    parser.add_argument("--max-hilos", type=int, default=4,
+                        help="crecimiento máximo del número de hilos (con --watchdog)")
+    parser.add_argument("--max-descriptores", type=int, default=16,
+                        help="crecimiento máximo de descriptores abiertos (con --watchdog)")
+    parser.add_argument("--max-deriva-latencia", type=float, default=2.0,
+                        help="factor máximo de la latencia por frame respecto a la base (con --watchdog)")
+    return parser.parse_args(argv)
+
+
+def crear_motor(args, mostrar_camara=True):
+    """Crear el motor local con la fuente de video y el watchdog indicados"""
+    motor = GestureEngine(mostrar_camara=mostrar_camara, fuente_video=args.video or 0)
+    if args.watchdog:
+        motor.watchdog = Watchdog(
+            motor,
+            intervalo=args.watchdog,
+            max_memoria_mb=args.max_memoria_mb,
+            max_hilos=args.max_hilos,
+            max_descriptores=args.max_descriptores,
+            max_deriva_latencia=args.max_deriva_latencia
+        ).start()
+    return motor
+
+
+def run_headless(args):
+    """Ejecutar el motor sin Tk ni bandeja, atendiendo comandos por el socket"""
+    ruta = args.socket or SOCKET_FILE
+    motor = crear_motor(args, mostrar_camara=False)
+    servidor = ControlServer(motor, ruta)
+
+    def detener(signum, frame):
+        # shutdown() bloquea hasta que serve_forever termina: llamarlo desde otro hilo
+        threading.Thread(target=servidor.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, detener)
+    signal.signal(signal.SIGINT, detener)
+
+    motor.start_processing()
+    motor.metricas_arranque = medir_arranque("headless")
+    print(f"Escuchando comandos en {ruta}")
+    try:
+        servidor.serve_forever()
+    finally:
+        motor.close()
+        servidor.server_close()
+
+
+def run_gui(args):
+    """Ejecutar la interfaz gráfica con el motor local o conectada a un proceso headless"""
+    cargar_gui()
+    motor = ControlClient(args.connect) if args.connect else crear_motor(args)
+    app = GestureController(motor)
+
+    servidor = None
+    if args.connect:
+        medir_arranque("cliente")
+    else:
+        motor.start_processing()  # Iniciar procesamiento automáticamente
+        if args.socket:
+            servidor = ControlServer(motor, args.socket)
+            threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        motor.metricas_arranque = medir_arranque("gui")
+
+    app.root.mainloop()
+    if servidor:
+        servidor.shutdown()
+        servidor.server_close()
+
+
 if __name__ == "__main__":
-    app = GestureController()
-    app.start_processing()  # Iniciar procesamiento automáticamente
-    app.root.mainloop()
\ No newline at end of file
+    args = parse_args()
+    if args.headless:
+        run_headless(args)
+    else:
+        run_gui(args)
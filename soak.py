@@ -0,0 +1,176 @@
+"""Prueba de resistencia (soak test) del procesamiento de gestos
+
+Reproduce un video grabado en bucle, tan rápido como se pueda procesar, durante
+horas de tiempo simulado (frames / fps del video). Mientras tanto alterna al azar
+la pausa, la recarga de la configuración, el ajuste de parámetros, el reinicio del
+procesamiento y la ventana de cámara, y falla si la memoria, los hilos, los
+descriptores de archivo o la latencia por frame crecen más de lo permitido.
+
+    python soak.py grabacion.mp4 --horas 4
+"""
+import argparse
+import collections
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+
+import gestuapp
+
+
+def parse_args(argv=None):
+    """Leer las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Prueba de resistencia del procesamiento de gestos")
+    parser.add_argument("video", help="video grabado que se reproduce en bucle como entrada")
+    parser.add_argument("--horas", type=float, default=1.0, help="tiempo simulado a recorrer (1 por defecto)")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de los eventos aleatorios")
+    parser.add_argument("--evento-cada", type=float, default=30.0, metavar="SEGUNDOS",
+                        help="segundos simulados entre eventos aleatorios (30 por defecto)")
+    parser.add_argument("--muestreo", type=float, default=300.0, metavar="SEGUNDOS",
+                        help="segundos simulados entre muestras del watchdog (300 por defecto)")
+    parser.add_argument("--ventana", action="store_true",
+                        help="mostrar y alternar la ventana de cámara (requiere pantalla)")
+    parser.add_argument("--max-memoria-mb", type=float, default=64.0, help="crecimiento máximo de memoria residente")
+    parser.add_argument("--max-python-mb", type=float, default=16.0,
+                        help="crecimiento máximo de la memoria reservada por Python (tracemalloc)")
+    parser.add_argument("--max-hilos", type=int, default=4, help="crecimiento máximo del número de hilos")
+    parser.add_argument("--max-descriptores", type=int, default=16, help="crecimiento máximo de descriptores abiertos")
+    parser.add_argument("--max-deriva-latencia", type=float, default=2.0,
+                        help="factor máximo de la latencia por frame respecto a la base")
+    parser.add_argument("--top", type=int, default=10, help="reservas de tracemalloc a mostrar")
+    return parser.parse_args(argv)
+
+
+def formatear(valor, formato):
+    """Formatear una métrica que puede no estar disponible (None)"""
+    return "n/d" if valor is None else format(valor, formato)
+
+
+def provocar_evento(motor, rng, ventana):
+    """Ejecutar un evento al azar sobre el motor y devolver su nombre"""
+    eventos = ["pausa", "recarga", "ajuste", "reinicio"] + (["ventana"] if ventana else [])
+    evento = rng.choice(eventos)
+    if evento == "pausa":
+        motor.pause_processing()
+    elif evento == "recarga":
+        motor.reload_config()
+    elif evento == "ajuste":
+        motor.update_config({"VELOCIDAD_SCROLL": round(rng.uniform(0.1, 1.0), 1)})
+    elif evento == "reinicio":
+        # Vuelve a crear la captura y el grafo de MediaPipe Hands
+        motor.restart_processing()
+    else:
+        motor.toggle_camera_window()
+    return evento
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    captura = cv2.VideoCapture(args.video)
+    abierto = captura.isOpened()
+    fps = captura.get(cv2.CAP_PROP_FPS) or 30.0
+    captura.release()
+    if not abierto:
+        print(f"No se pudo abrir el video: {args.video}")
+        return 2
+
+    # Configuración temporal para no modificar la del usuario
+    directorio = tempfile.mkdtemp(prefix="gestuapp_soak_")
+
+    tracemalloc.start(25)
+    motor = gestuapp.GestureEngine(mostrar_camara=args.ventana, fuente_video=args.video,
+                                   ruta_config=os.path.join(directorio, "config.json"))
+
+    # Registrar las teclas en lugar de enviarlas y medir el tiempo en frames del video
+    pulsaciones = collections.Counter()
+    motor.pulsar_tecla = lambda tecla: pulsaciones.update([tecla])
+    motor.reloj = lambda: motor.frames_procesados / fps
+
+    watchdog = gestuapp.Watchdog(
+        motor,
+        calentamiento=1,
+        max_memoria_mb=args.max_memoria_mb,
+        max_hilos=args.max_hilos,
+        max_descriptores=args.max_descriptores,
+        max_deriva_latencia=args.max_deriva_latencia
+    )
+    rng = random.Random(args.semilla)
+    eventos = collections.Counter()
+    snapshot_base = None
+    python_base = None
+    alertas_python = []
+
+    def muestrear():
+        nonlocal snapshot_base, python_base
+        watchdog.comprobar()
+        python_mb = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+        if watchdog.base is not None and snapshot_base is None:
+            snapshot_base = tracemalloc.take_snapshot()
+            python_base = python_mb
+        elif python_base is not None and python_mb - python_base > args.max_python_mb:
+            alerta = f"memoria de Python creció {python_mb - python_base:.1f} MB (límite {args.max_python_mb})"
+            print(f"Watchdog: {alerta}")
+            alertas_python.append(alerta)
+
+        muestra = watchdog.ultima
+        print(f"[{motor.reloj() / 3600:6.2f} h] memoria: {formatear(muestra['memoria_mb'], '.1f')} MB, "
+              f"python: {python_mb:.1f} MB, hilos: {muestra['hilos']}, "
+              f"descriptores: {formatear(muestra['descriptores'], 'd')}, "
+              f"latencia: {formatear(muestra['latencia_ms'], '.2f')} ms")
+
+    duracion = args.horas * 3600
+    proximo_evento = args.evento_cada
+    proximo_muestreo = args.muestreo
+    inicio = time.perf_counter()
+    detenido = False
+
+    motor.start_processing()
+    try:
+        while motor.reloj() < duracion:
+            if not motor.running:
+                detenido = True
+                print("El procesamiento se detuvo inesperadamente")
+                break
+            if motor.reloj() >= proximo_evento:
+                eventos[provocar_evento(motor, rng, args.ventana)] += 1
+                proximo_evento += args.evento_cada
+            if motor.reloj() >= proximo_muestreo:
+                muestrear()
+                proximo_muestreo += args.muestreo
+            time.sleep(0.01)
+        muestrear()
+    finally:
+        motor.close()
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    real = time.perf_counter() - inicio
+    print(f"\nSimulado: {motor.reloj() / 3600:.2f} h en {real / 60:.1f} min (x{motor.reloj() / real:.1f}), "
+          f"{motor.frames_procesados} frames")
+    print(f"Eventos: {dict(eventos)}")
+    print(f"Teclas: {dict(pulsaciones)}")
+
+    if snapshot_base is not None:
+        print(f"\nMayores crecimientos de memoria (tracemalloc, top {args.top}):")
+        for estadistica in tracemalloc.take_snapshot().compare_to(snapshot_base, "lineno")[:args.top]:
+            print(f"  {estadistica}")
+    tracemalloc.stop()
+
+    total_alertas = watchdog.total_alertas + len(alertas_python)
+    if watchdog.sin_medir:
+        # Un límite que no se puede comprobar no debe darse por cumplido
+        print(f"\nFALLO: no se pudo medir {', '.join(sorted(watchdog.sin_medir))}")
+        return 1
+    if detenido or total_alertas:
+        print(f"\nFALLO: {total_alertas} alertas")
+        return 1
+    print("\nOK: sin crecimiento fuera de los límites")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
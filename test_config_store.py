@@ -0,0 +1,204 @@
+"""Pruebas de ConfigStore (solo biblioteca estándar)
+
+    python -m unittest test_config_store
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import config_store
+from config_store import CONFIG_VERSION, DEFAULT_CONFIG, ConfigStore
+
+
+class ConfigStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp(prefix="gestuapp_test_")
+        self.ruta = os.path.join(self.directorio, "config.json")
+        # Se ejecuta después del flush de cada store (addCleanup es LIFO)
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+
+    def escribir(self, datos):
+        with open(self.ruta, "w") as f:
+            f.write(datos if isinstance(datos, str) else json.dumps(datos))
+
+    def leer(self):
+        with open(self.ruta) as f:
+            return json.load(f)
+
+    def crear(self, retardo=0.05):
+        store = ConfigStore(self.ruta, retardo=retardo)
+        self.addCleanup(store.flush)
+        return store
+
+    def test_sin_archivo_usa_valores_por_defecto(self):
+        store = self.crear()
+        self.assertEqual(store.config, DEFAULT_CONFIG)
+        self.assertFalse(os.path.exists(self.ruta))
+
+    def test_agrupa_cambios_seguidos_en_una_escritura(self):
+        store = self.crear(retardo=0.2)
+        with mock.patch.object(config_store.os, "replace", wraps=os.replace) as reemplazar:
+            for valor in (0.1, 0.2, 0.3, 0.4):
+                store.update({"VELOCIDAD_SCROLL": valor})
+            self.assertFalse(os.path.exists(self.ruta))
+            time.sleep(0.5)
+        self.assertEqual(reemplazar.call_count, 1)
+        self.assertEqual(self.leer()["VELOCIDAD_SCROLL"], 0.4)
+        self.assertEqual(self.leer()["VERSION"], CONFIG_VERSION)
+
+    def test_flush_escribe_sin_esperar(self):
+        store = self.crear(retardo=60)
+        store.update({"UMBRAL_PAUSA": 0.03})
+        store.flush()
+        self.assertEqual(self.leer()["UMBRAL_PAUSA"], 0.03)
+
+    def test_reemplazo_atomico(self):
+        self.escribir({"VERSION": CONFIG_VERSION, "VELOCIDAD_SCROLL": 0.7})
+        store = self.crear()
+        store.update({"VELOCIDAD_SCROLL": 0.9})
+        with mock.patch.object(config_store.json, "dump", side_effect=OSError("disco lleno")):
+            store.flush()
+        # Un fallo a mitad de escritura no toca el archivo ni deja temporales
+        self.assertEqual(self.leer()["VELOCIDAD_SCROLL"], 0.7)
+        self.assertEqual(os.listdir(self.directorio), ["config.json"])
+
+        store.flush()
+        self.assertEqual(self.leer()["VELOCIDAD_SCROLL"], 0.9)
+        self.assertEqual(os.listdir(self.directorio), ["config.json"])
+
+    def test_migra_v1(self):
+        self.escribir({"VELOCIDAD_SCROLL": 0.8, "GESTOS_ACCIONES": {"pulgar_indice_cerca": "nada"}})
+        store = self.crear()
+        self.assertEqual(store.config["GESTOS_ACCIONES"]["pulgar_indice_cerca"], "nada")
+        self.assertEqual(store.config["GESTOS_ACCIONES"]["angulo_pequeno_movimiento"], "scroll")
+
+        guardado = self.leer()
+        self.assertEqual(guardado["VERSION"], CONFIG_VERSION)
+        self.assertEqual(guardado["VELOCIDAD_SCROLL"], 0.8)
+        self.assertEqual(set(guardado["GESTOS_ACCIONES"]), set(DEFAULT_CONFIG["GESTOS_ACCIONES"]))
+
+    def test_no_sobrescribe_una_version_mas_nueva(self):
+        original = {"VERSION": CONFIG_VERSION + 1, "VELOCIDAD_SCROLL": 0.8, "NUEVO": True}
+        self.escribir(original)
+        store = self.crear()
+        self.assertEqual(store.config["VELOCIDAD_SCROLL"], 0.8)
+        store.update({"VELOCIDAD_SCROLL": 0.2})
+        store.flush()
+        self.assertEqual(self.leer(), original)
+
+    def test_archivos_mal_formados(self):
+        for contenido in ("{no es json", "[1, 2]", '{"VERSION": "2"}', '{"VERSION": 0}'):
+            with self.subTest(contenido=contenido):
+                self.escribir(contenido)
+                self.assertEqual(self.crear().config, DEFAULT_CONFIG)
+
+    def test_valores_no_validos_toman_el_por_defecto(self):
+        self.escribir('{"VERSION": 2, "UMBRAL_PAUSA": NaN, "VELOCIDAD_SCROLL": -1, '
+                      '"INVERTIR_DIRECCION_CANCION": 1, "TIEMPO_ENTRE_ACCIONES": 2.0}')
+        store = self.crear()
+        self.assertEqual(store.config["UMBRAL_PAUSA"], DEFAULT_CONFIG["UMBRAL_PAUSA"])
+        self.assertEqual(store.config["VELOCIDAD_SCROLL"], DEFAULT_CONFIG["VELOCIDAD_SCROLL"])
+        self.assertIs(store.config["INVERTIR_DIRECCION_CANCION"], False)
+        self.assertEqual(store.config["TIEMPO_ENTRE_ACCIONES"], 2.0)
+
+    def test_rechaza_valores_no_validos(self):
+        store = self.crear()
+        for cambios in ({"UMBRAL_PAUSA": float("nan")}, {"UMBRAL_PAUSA": float("inf")},
+                        {"UMBRAL_PAUSA": -0.1}, {"UMBRAL_PAUSA": True}, {"UMBRAL_PAUSA": "0.1"},
+                        {"INVERTIR_DIRECCION_CANCION": 1},
+                        {"GESTOS_ACCIONES": {"pulgar_indice_cerca": "volar"}}):
+            with self.subTest(cambios=cambios), self.assertRaises(ValueError):
+                store.update(cambios)
+        with self.assertRaises(KeyError):
+            store.update({"DESCONOCIDO": 1})
+        self.assertEqual(store.config, DEFAULT_CONFIG)
+
+    def test_reset_no_comparte_los_valores_por_defecto(self):
+        store = self.crear()
+        store.update({"GESTOS_ACCIONES": {"pulgar_indice_cerca": "nada"}})
+        diff = store.reset()
+        self.assertEqual(diff, {"GESTOS_ACCIONES": (
+            dict(DEFAULT_CONFIG["GESTOS_ACCIONES"], pulgar_indice_cerca="nada"),
+            DEFAULT_CONFIG["GESTOS_ACCIONES"]
+        )})
+        store.update({"GESTOS_ACCIONES": {"angulo_grande_derecha": "nada"}})
+        self.assertEqual(DEFAULT_CONFIG["GESTOS_ACCIONES"]["angulo_grande_derecha"], "siguiente")
+
+        copia = store.get()
+        copia["GESTOS_ACCIONES"]["angulo_grande_izquierda"] = "nada"
+        self.assertEqual(store.config["GESTOS_ACCIONES"]["angulo_grande_izquierda"], "anterior")
+
+    def test_filtra_el_diff_por_claves(self):
+        store = self.crear()
+        todos, filtrados = [], []
+        store.subscribe(todos.append)
+        store.subscribe(filtrados.append, ["VELOCIDAD_SCROLL"])
+
+        store.update({"UMBRAL_PAUSA": 0.03})
+        store.update({"UMBRAL_PAUSA": 0.03})  # Sin cambios: no se notifica
+        store.update({"UMBRAL_PAUSA": 0.04, "VELOCIDAD_SCROLL": 0.9})
+
+        self.assertEqual(todos, [
+            {"UMBRAL_PAUSA": (0.025, 0.03)},
+            {"UMBRAL_PAUSA": (0.03, 0.04), "VELOCIDAD_SCROLL": (0.5, 0.9)}
+        ])
+        self.assertEqual(filtrados, [{"VELOCIDAD_SCROLL": (0.5, 0.9)}])
+
+        store.unsubscribe(todos.append)
+        store.reload()
+        self.assertEqual(len(todos), 2)
+        self.assertEqual(filtrados[-1], {"VELOCIDAD_SCROLL": (0.9, 0.5)})
+
+    def test_valida_las_claves_de_suscripcion(self):
+        store = self.crear()
+        for claves in ("VELOCIDAD_SCROLL", 5, [], ["NO_EXISTE"], [1]):
+            with self.subTest(claves=claves), self.assertRaises(ValueError):
+                store.subscribe(print, claves)
+
+    def test_notifica_en_orden_desde_varios_threads(self):
+        store = self.crear()
+        diffs = []
+        store.subscribe(lambda diff: diffs.append(diff["VELOCIDAD_SCROLL"]))
+
+        def escribir(base):
+            for i in range(100):
+                store.update({"VELOCIDAD_SCROLL": base + i})
+
+        hilos = [threading.Thread(target=escribir, args=(base,)) for base in (1000, 2000, 3000, 4000)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(len(diffs), 400)
+        for anterior, siguiente in zip(diffs, diffs[1:]):
+            self.assertEqual(anterior[1], siguiente[0])
+        self.assertEqual(diffs[-1][1], store.config["VELOCIDAD_SCROLL"])
+
+    def test_suscriptor_que_espera_a_otro_thread(self):
+        # Como root.after desde un thread que no es el de Tk: el callback espera a
+        # otro thread que también modifica la configuración
+        store = self.crear()
+        recibidos = []
+
+        def callback(diff):
+            recibidos.append(diff)
+            if "VELOCIDAD_SCROLL" in diff:
+                hilo = threading.Thread(target=store.update, args=({"UMBRAL_PAUSA": 0.03},))
+                hilo.start()
+                hilo.join(timeout=2)
+                self.assertFalse(hilo.is_alive())
+
+        store.subscribe(callback)
+        store.update({"VELOCIDAD_SCROLL": 0.9})
+        self.assertEqual(recibidos, [{"VELOCIDAD_SCROLL": (0.5, 0.9)}, {"UMBRAL_PAUSA": (0.025, 0.03)}])
+
+
+if __name__ == "__main__":
+    unittest.main()